@@ -0,0 +1,74 @@
+"""
+This module provides a thin async Redis wrapper used as a cache-aside layer in
+front of the graph retriever. Redis is optional infrastructure: every operation
+degrades to a cache miss (returning None / doing nothing) when the server is
+unreachable, so the RAG pipeline never depends on it being up.
+"""
+
+import os
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+# Lazily created module-level client (one connection pool per process)
+_client: Optional[redis.Redis] = None
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.from_url(_REDIS_URL)
+    return _client
+
+
+async def get(key: str) -> Optional[bytes]:
+    """
+    Returns the cached value for `key`, or None on miss or Redis failure.
+    """
+    try:
+        return await _get_client().get(key)
+    except Exception as e:
+        logger.warning("Redis GET failed (treating as miss): %s", e)
+        return None
+
+
+async def setex(key: str, ttl: int, value: str) -> None:
+    """
+    Stores `value` under `key` with a TTL in seconds.
+    """
+    try:
+        await _get_client().setex(key, ttl, value)
+    except Exception as e:
+        logger.warning("Redis SETEX failed (skipping cache write): %s", e)
+
+
+async def get_generation(key: str) -> Optional[int]:
+    """
+    Returns the current generation counter under `key` (0 when unset), or
+    None on Redis failure — callers should then bypass the cache entirely.
+    """
+    try:
+        value = await _get_client().get(key)
+        return int(value) if value is not None else 0
+    except Exception as e:
+        logger.warning("Redis generation read failed (bypassing cache): %s", e)
+        return None
+
+
+async def bump_generation(key: str) -> None:
+    """
+    Increments the generation counter under `key`. Every cache entry whose
+    key embeds the old generation becomes unreachable at once, which makes
+    invalidation race-free: a concurrent reader that still writes an entry
+    under the old generation parks it where no future lookup ever goes.
+    """
+    try:
+        await _get_client().incr(key)
+    except Exception as e:
+        logger.warning("Redis generation bump failed for %s: %s", key, e)
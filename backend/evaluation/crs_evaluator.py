@@ -1,6 +1,51 @@
 from typing import List, Dict, Callable, Any
+
+import numpy as np
 from pydantic import BaseModel
 
+# Metric order shared by the weights vector and the per-request metric vector
+_METRIC_KEYS = (
+    "context_recall",
+    "context_precision",
+    "temporal_stability",
+    "dependency_resolution",
+    "context_decay_resistance"
+)
+
+
+class _Interner:
+    """
+    Assigns each unique string a stable bit index so sets of strings can be
+    represented as int bitmasks. Intersections/unions then become single
+    bitwise ops and cardinalities hardware popcounts (int.bit_count).
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._vocab: List[str] = []
+
+    def mask(self, items: List[str]) -> int:
+        ids = self._ids
+        m = 0
+        for s in items:
+            idx = ids.get(s)
+            if idx is None:
+                idx = len(self._vocab)
+                ids[s] = idx
+                self._vocab.append(s)
+            m |= 1 << idx
+        return m
+
+    def unmask(self, mask: int) -> List[str]:
+        vocab = self._vocab
+        return [vocab[i] for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+# Process-wide vocabularies; entities and topics are only ever compared
+# within their own kind, so separate interners keep the masks narrow.
+_ENTITIES = _Interner()
+_TOPICS = _Interner()
+
 class CRSScores(BaseModel):
     context_recall: float
     context_precision: float
@@ -37,88 +82,110 @@ class CRSEvaluator:
             "dependency_resolution": 0.2,
             "context_decay_resistance": 0.1
         }
+        # Dense weights vector so the composite is one dot product instead of
+        # five dict lookups and scalar multiply-adds per request.
+        self._weights_arr = np.array(
+            [self.weights[k] for k in _METRIC_KEYS], dtype=np.float64
+        )
 
     def evaluate(
         self,
         query_text: str,
         response_text: str,
         context_text: str,
-        extract_func: Callable[[str], Dict[str, List[str]]]
+        extract_batch_func: Callable[[List[str]], List[Dict[str, List[str]]]]
     ) -> CRSScores:
         """
-        Calculates CRS sub-metrics and composite score using the provided extraction function.
+        Calculates CRS sub-metrics and composite score using the provided
+        batched extraction function (one spaCy pass for all three texts).
         """
-        # 1. Extract entities/topics
-        q_ext = extract_func(query_text)
-        r_ext = extract_func(response_text)
-        c_ext = extract_func(context_text)
-
-        q_ents = set(q_ext.get("entities", []))
-        r_ents = set(r_ext.get("entities", []))
-        c_ents = set(c_ext.get("entities", []))
-        
-        q_topics = set(q_ext.get("topics", []))
-        r_topics = set(r_ext.get("topics", []))
-        c_topics = set(c_ext.get("topics", []))
+        # 1. Extract entities/topics in a single batched call. Empty texts
+        # (typically the context on a first turn) trivially extract to
+        # nothing, so only non-empty texts enter the NER batch.
+        texts = [query_text, response_text, context_text]
+        empty_ext: Dict[str, List[str]] = {"entities": [], "topics": []}
+        non_empty = [t for t in texts if t]
+        if non_empty:
+            extracted = iter(extract_batch_func(non_empty))
+            q_ext, r_ext, c_ext = [
+                next(extracted) if t else empty_ext for t in texts
+            ]
+        else:
+            q_ext = r_ext = c_ext = empty_ext
+
+        q_ents = _ENTITIES.mask(q_ext.get("entities", []))
+        r_ents = _ENTITIES.mask(r_ext.get("entities", []))
+        c_ents = _ENTITIES.mask(c_ext.get("entities", []))
+
+        q_topics = _TOPICS.mask(q_ext.get("topics", []))
+        r_topics = _TOPICS.mask(r_ext.get("topics", []))
+        c_topics = _TOPICS.mask(c_ext.get("topics", []))
 
         # 2. Calculate Metrics
+        # Every set operation below is a bitwise op + popcount on the masks.
+
+        # Shared between recall and precision
+        rc_inter = (r_ents & c_ents).bit_count()
 
         # Context Recall: Entities in Response / Entities in Context
-        # (Handling div-by-zero: if no context entities, recall is 1.0 if response also has none, else 0?)
         # Logic: If context has no entities, recall is N/A or perfect. Let's say 1.0 if context empty.
         if not c_ents:
             recall = 1.0
         else:
-            recall = len(r_ents.intersection(c_ents)) / len(c_ents)
+            recall = rc_inter / c_ents.bit_count()
 
         # Context Precision: Entities in Response matching Context / All Entities in Response
         if not r_ents:
             precision = 1.0 # No hallucinations if no entities
         else:
-            precision = len(r_ents.intersection(c_ents)) / len(r_ents)
+            precision = rc_inter / r_ents.bit_count()
 
         # Dependency Resolution: Entities in Response matching Query / All Entities in Query
         if not q_ents:
             dep_res = 1.0
         else:
             # We check if response entities cover query entities (direct addressing)
-            dep_res = len(r_ents.intersection(q_ents)) / len(q_ents)
+            dep_res = (r_ents & q_ents).bit_count() / q_ents.bit_count()
 
         # Temporal Stability: Topic Consistency
         # Jaccard similarity between (Query Topics + Context Topics) and Response Topics
-        target_topics = q_topics.union(c_topics)
+        target_topics = q_topics | c_topics
         if not target_topics and not r_topics:
             stability = 1.0
         elif not target_topics or not r_topics:
             stability = 0.0
         else:
-            stability = len(r_topics.intersection(target_topics)) / len(r_topics.union(target_topics))
+            stability = (
+                (r_topics & target_topics).bit_count()
+                / (r_topics | target_topics).bit_count()
+            )
 
         # Context Decay Resistance
         # Placeholder for now as we treat this as a snapshot. 
         # Using 1.0 to indicate no detected decay in this immediate window.
         decay = 1.0 
 
-        # 3. Composite Score
-        composite = (
-            recall * self.weights["context_recall"] +
-            precision * self.weights["context_precision"] +
-            stability * self.weights["temporal_stability"] +
-            dep_res * self.weights["dependency_resolution"] +
-            decay * self.weights["context_decay_resistance"]
+        # 3. Composite Score: single dot product, then one vectorized rounding
+        # pass over all six values.
+        metrics = np.array(
+            [recall, precision, stability, dep_res, decay], dtype=np.float64
         )
+        composite = float(metrics @ self._weights_arr)
+        recall, precision, stability, dep_res, decay, composite = np.round(
+            np.append(metrics, composite), 3
+        ).tolist()
 
         return CRSScores(
-            context_recall=round(recall, 3),
-            context_precision=round(precision, 3),
-            temporal_stability=round(stability, 3),
-            dependency_resolution=round(dep_res, 3),
-            context_decay_resistance=round(decay, 3),
-            composite_score=round(composite, 3),
-            query_entities=list(q_ents),
-            response_entities=list(r_ents),
-            context_entities=list(c_ents),
-            query_topics=list(q_topics),
-            response_topics=list(r_topics),
-            context_topics=list(c_topics)
+            context_recall=recall,
+            context_precision=precision,
+            temporal_stability=stability,
+            dependency_resolution=dep_res,
+            context_decay_resistance=decay,
+            composite_score=composite,
+            query_entities=_ENTITIES.unmask(q_ents),
+            response_entities=_ENTITIES.unmask(r_ents),
+            context_entities=_ENTITIES.unmask(c_ents),
+            query_topics=_TOPICS.unmask(q_topics),
+            response_topics=_TOPICS.unmask(r_topics),
+            context_topics=_TOPICS.unmask(c_topics)
         )
@@ -1,25 +1,126 @@
-from neo4j import GraphDatabase
-from datetime import datetime, timezone
+import time
+
+from .. import cache
+
+# Single batched write statement: one round-trip creates the event, links the
+# user, and MERGEs every entity/topic. FOREACH (rather than UNWIND) keeps the
+# row alive when the entity or topic list is empty.
+_WRITE_INTERACTION_QUERY = """
+MERGE (u:User {id: $user_id})
+CREATE (e:Event {
+    type: $event_type,
+    timestamp: $timestamp,
+    content: $content
+})
+MERGE (u)-[:ASKED_ABOUT]->(e)
+WITH e
+OPTIONAL MATCH (prev:Event) WHERE id(prev) = $previous_event_id
+FOREACH (name IN $entities |
+    MERGE (en:Entity {name: name})
+    MERGE (e)-[:MENTIONS]->(en)
+)
+FOREACH (name IN $topics |
+    MERGE (t:Topic {name: name})
+    MERGE (e)-[:ASKED_ABOUT]->(t)
+)
+FOREACH (p IN CASE WHEN prev IS NULL THEN [] ELSE [prev] END |
+    MERGE (e)-[:PREVIOUS_CONTEXT]->(p)
+)
+RETURN id(e) AS event_id
+"""
+
+# Unique constraints make the MERGE/MATCH-by-name lookups in the write and
+# retrieval paths index-backed instead of label scans; the timestamp index
+# supports the retriever's ORDER BY e.timestamp DESC. All statements are
+# idempotent (IF NOT EXISTS).
+_SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT user_id_unique IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.id IS UNIQUE",
+    "CREATE CONSTRAINT entity_name_unique IF NOT EXISTS "
+    "FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT topic_name_unique IF NOT EXISTS "
+    "FOR (t:Topic) REQUIRE t.name IS UNIQUE",
+    "CREATE INDEX event_timestamp IF NOT EXISTS "
+    "FOR (e:Event) ON (e.timestamp)"
+)
 
 class GraphMemory:
-    def __init__(self, uri, username, password):
-        self.driver = GraphDatabase.driver(
-            uri,
-            auth = (username, password)
+    def __init__(self, driver):
+        # Shared neo4j.AsyncDriver owned by the application lifecycle; the
+        # memory writer never opens or closes connections itself.
+        self.driver = driver
+
+    async def ensure_schema(self):
+        """
+        Creates the uniqueness constraints and indexes the hot queries rely
+        on. Intended to run once at application startup.
+        """
+        async with self.driver.session() as session:
+            for statement in _SCHEMA_STATEMENTS:
+                await session.run(statement)
+
+    async def _write_event(self, user_id, event_type, content, entities, topics, previous_event_id=None):
+        async def work(tx):
+            result = await tx.run(
+                _WRITE_INTERACTION_QUERY,
+                user_id=user_id,
+                event_type=event_type,
+                timestamp=time.time_ns(),
+                content=content,
+                entities=entities,
+                topics=topics,
+                previous_event_id=previous_event_id
+            )
+            return await result.single()
+
+        async with self.driver.session() as session:
+            record = await session.execute_write(work)
+
+        # The user's graph changed: bumping their generation makes every
+        # cached retrieval context unreachable, including ones a concurrent
+        # retrieval is still about to write under the old generation.
+        await cache.bump_generation(f"ctx:gen:{user_id}")
+        return record["event_id"]
+
+    async def write_interaction(self, user_id, message, entities, topics):
+        return await self._write_event(
+            user_id,
+            "USER_QUERY",
+            message,
+            entities,
+            topics
+        )
+
+    async def store_interaction(
+        self,
+        user_id,
+        event_type,
+        entities,
+        topics,
+        previous_event_id=None
+    ):
+        return await self._write_event(
+            user_id,
+            event_type,
+            None,
+            entities,
+            topics,
+            previous_event_id=previous_event_id
         )
 
-    def close(self):
-        self.driver.close()
+    # ------------------------------------------------------------------
+    # Fine-grained utilities (no longer on the hot write path)
+    # ------------------------------------------------------------------
 
-    def get_or_create_user(self, user_id):
+    async def get_or_create_user(self, user_id):
         query = """
             MERGE (u:User {id: $user_id})
             RETURN u
         """
-        with self.driver.session() as session:
-            session.run(query, user_id=user_id)
+        async with self.driver.session() as session:
+            await session.run(query, user_id=user_id)
 
-    def create_event(self, event_type, content=None):
+    async def create_event(self, event_type, content=None):
         query = """
         CREATE (e:Event {
             type: $event_type,
@@ -28,89 +129,72 @@ class GraphMemory:
         })
         RETURN e
         """
-        with self.driver.session() as session:
-            result = session.run(
+        async with self.driver.session() as session:
+            result = await session.run(
                 query,
                 event_type=event_type,
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=time.time_ns(),
                 content=content
             )
-            return result.single()["e"]
+            record = await result.single()
+            return record["e"]
 
-    def link_user_event(self, user_id, event_id):
+    async def link_user_event(self, user_id, event_id):
         query = """
         MATCH (u:User {id: $user_id})
         MATCH (e:Event) WHERE id(e) = $event_id
         MERGE (u)-[:ASKED_ABOUT]->(e)
         """
-        with self.driver.session() as session:
-            session.run(
+        async with self.driver.session() as session:
+            await session.run(
                 query,
                 user_id=user_id,
                 event_id=event_id
             )
 
-    def write_interaction(self, user_id, message, entities, topics):
-        self.get_or_create_user(user_id)
-        
-        event = self.create_event("USER_QUERY", content=message)
-        event_id = event.id
-        
-        self.link_user_event(user_id, event_id)
-        
-        for entity in entities:
-            self.get_or_create_entity(entity)
-            self.link_event_entity(event_id, entity)
-            
-        for topic in topics:
-            self.get_or_create_topic(topic)
-            self.link_event_topic(event_id, topic)
-            
-        return event_id
-        
-    def get_or_create_entity(self, entity_name):
+    async def get_or_create_entity(self, entity_name):
         query = """
         MERGE (e:Entity {name: $name})
         RETURN e
         """
-        with self.driver.session() as session:
-            session.run(query, name=entity_name)
+        async with self.driver.session() as session:
+            await session.run(query, name=entity_name)
 
-    def get_or_create_topic(self, topic_name):
+    async def get_or_create_topic(self, topic_name):
         query = """
         MERGE (t:Topic {name: $name})
         RETURN t
         """
-        with self.driver.session() as session:
-            session.run(query, name=topic_name)
+        async with self.driver.session() as session:
+            await session.run(query, name=topic_name)
 
-    def link_event_entity(self, event_id, entity_name):
+    async def link_event_entity(self, event_id, entity_name):
         query = """
         MATCH (e:Event) WHERE id(e) = $event_id
         MATCH (en:Entity {name: $entity_name})
         MERGE (e)-[:MENTIONS]->(en)
         """
-        with self.driver.session() as session:
-            session.run(
+        async with self.driver.session() as session:
+            await session.run(
                 query,
                 event_id=event_id,
                 entity_name=entity_name
             )
 
-    def link_event_topic(self, event_id, topic_name):
+    async def link_event_topic(self, event_id, topic_name):
         query = """
         MATCH (e:Event) WHERE id(e) = $event_id
         MATCH (t:Topic {name: $topic_name})
         MERGE (e)-[:ASKED_ABOUT]->(t)
         """
-        with self.driver.session() as session:
-            session.run(
+        async with self.driver.session() as session:
+            await session.run(
                 query,
                 event_id=event_id,
                 topic_name=topic_name
             )
-    
-    def link_previous_event(self, current_event_id, previous_event_id):
+
+    async def link_previous_event(self, current_event_id, previous_event_id):
         if previous_event_id is None:
             return
 
@@ -119,36 +203,9 @@ class GraphMemory:
         MATCH (prev:Event) WHERE id(prev) = $prev_id
         MERGE (curr)-[:PREVIOUS_CONTEXT]->(prev)
         """
-        with self.driver.session() as session:
-            session.run(
+        async with self.driver.session() as session:
+            await session.run(
                 query,
                 curr_id=current_event_id,
                 prev_id=previous_event_id
             )
-
-    def store_interaction(
-        self,
-        user_id,
-        event_type,
-        entities,
-        topics,
-        previous_event_id=None
-    ):
-        self.get_or_create_user(user_id)
-
-        event = self.create_event(event_type)
-        event_id = event.id
-
-        self.link_user_event(user_id, event_id)
-
-        for entity in entities:
-            self.get_or_create_entity(entity)
-            self.link_event_entity(event_id, entity)
-
-        for topic in topics:
-            self.get_or_create_topic(topic)
-            self.link_event_topic(event_id, topic)
-
-        self.link_previous_event(event_id, previous_event_id)
-
-        return event_id
\ No newline at end of file
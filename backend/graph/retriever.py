@@ -1,87 +1,130 @@
-from neo4j import GraphDatabase
+import hashlib
+import json
+import time
+
+from .. import cache
+
+# Entity and topic lookups fused into one statement so a retrieval costs a
+# single Bolt round-trip. UNION already removes exact duplicate rows; the
+# cross-branch dedup happens in _merge_contexts. The $before filter bounds
+# both branches to events that existed when the request started: we want
+# context from past events, not the current one, and with the write of the
+# current event running concurrently its row (newest timestamp, exactly the
+# entities just extracted) would otherwise win a LIMIT slot. Timestamps are
+# epoch-ns ints, so the filter rides the event_timestamp index.
+_RETRIEVE_CONTEXT_QUERY = """
+CALL {
+    MATCH (u:User {id: $user_id})-[:ASKED_ABOUT]->(e:Event)
+          -[:MENTIONS]->(en:Entity)
+    WHERE en.name IN $entities AND e.timestamp < $before
+    RETURN e.type AS type, e.timestamp AS timestamp,
+           en.name AS key, 'entity' AS kind
+    UNION
+    MATCH (u:User {id: $user_id})-[:ASKED_ABOUT]->(e:Event)
+          -[:ASKED_ABOUT]->(t:Topic)
+    WHERE t.name IN $topics AND e.timestamp < $before
+    RETURN e.type AS type, e.timestamp AS timestamp,
+           t.name AS key, 'topic' AS kind
+}
+RETURN type, timestamp, key, kind
+ORDER BY timestamp DESC
+LIMIT $limit
+"""
 
 class GraphRetriever:
-    def __init__(self, uri, username, password):
-        self.driver = GraphDatabase.driver(
-            uri,
-            auth=(username, password)
-        )
+    def __init__(self, driver):
+        # Shared neo4j.AsyncDriver owned by the application lifecycle; the
+        # retriever never opens or closes connections itself.
+        self.driver = driver
 
-    def close(self):
-        self.driver.close()
-    
-    def retrieve_context(
+    async def retrieve_context(
         self,
         user_id,
         entities,
         topics,
-        max_events=5
+        max_events=5,
+        before=None
     ):
-        entity_context = self._retrieve_by_entities(
-            user_id, entities, max_events
-        )
-        topic_context = self._retrieve_by_topics(
-            user_id, topics, max_events
-        )
+        # `before` is the retrieval cutoff in epoch ns; callers racing a
+        # concurrent write pass a snapshot taken before the write started so
+        # the new event cannot appear in its own context.
+        if before is None:
+            before = time.time_ns()
 
-        return self._merge_contexts(entity_context, topic_context)
-    
-    def _retrieve_by_entities(self, user_id, entities, max_events):
-        if not entities:
-            return []
+        if not entities and not topics:
+            return self._merge_contexts([])
 
-        query = """
-        MATCH (u:User {id: $user_id})-[:ASKED_ABOUT]->(e:Event)
-              -[:MENTIONS]->(en:Entity)
-        WHERE en.name IN $entities
-        RETURN e.type AS type, e.timestamp AS timestamp, en.name AS entity
-        ORDER BY e.timestamp DESC
-        LIMIT $limit
-        """
+        # Cache-aside: hot (user, entities, topics) combinations skip Neo4j
+        # entirely for a short window. The user's generation counter is part
+        # of the key; the write path bumps it, so entries cached against an
+        # older graph state become unreachable instead of being deleted.
+        # Reading the generation BEFORE the graph query is what makes the
+        # concurrent-write race benign: if a write lands in between, its
+        # bump (which strictly follows the commit) parks our entry under a
+        # dead generation; if the bump happened first, our query already
+        # sees the committed write.
+        generation = await cache.get_generation(f"ctx:gen:{user_id}")
 
-        with self.driver.session() as session:
-            result = session.run(
-                query,
-                user_id=user_id,
-                entities=entities,
-                limit=max_events
-            )
-            return [record.data() for record in result]
-        
-    def _retrieve_by_topics(self, user_id, topics, max_events):
-        if not topics:
-            return []
+        # `before` stays out of the digest on purpose: it differs per request
+        # and would defeat the cache, and a cached entry only outlives its
+        # cutoff while no write has bumped the generation — i.e. while no
+        # event exists in the window the older cutoff would exclude.
+        digest = hashlib.blake2b(
+            json.dumps([sorted(entities), sorted(topics), max_events]).encode()
+        ).hexdigest()
+        cache_key = f"ctx:{user_id}:{generation}:{digest}"
 
-        query = """
-        MATCH (u:User {id: $user_id})-[:ASKED_ABOUT]->(e:Event)
-              -[:ASKED_ABOUT]->(t:Topic)
-        WHERE t.name IN $topics
-        RETURN e.type AS type, e.timestamp AS timestamp, t.name AS topic
-        ORDER BY e.timestamp DESC
-        LIMIT $limit
-        """
+        if generation is not None:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
 
-        with self.driver.session() as session:
-            result = session.run(
-                query,
+        async with self.driver.session() as session:
+            result = await session.run(
+                _RETRIEVE_CONTEXT_QUERY,
                 user_id=user_id,
+                entities=entities,
                 topics=topics,
+                before=before,
                 limit=max_events
             )
-            return [record.data() for record in result]
-        
-    def _merge_contexts(self, entity_ctx, topic_ctx):
-        seen = set()
-        merged = []
+            rows = [record.data() async for record in result]
+
+        context = self._merge_contexts(rows)
+        # generation is None only when Redis is down; don't cache blind.
+        if generation is not None:
+            await cache.setex(cache_key, 60, json.dumps(context, default=str))
+        return context
+
+    def _merge_contexts(self, rows):
+        entity_count = 0
+        topic_count = 0
+        # Dedup by (type, timestamp) through plain dict insertion: setdefault
+        # keeps the first-seen item per key in one O(1) amortized hash op,
+        # replacing the separate seen-set plus membership branch. CPython
+        # dicts preserve insertion order, so event ordering is retained.
+        deduped = {}
+
+        for row in rows:
+            if row["kind"] == "entity":
+                entity_count += 1
+                item = {
+                    "type": row["type"],
+                    "timestamp": row["timestamp"],
+                    "entity": row["key"]
+                }
+            else:
+                topic_count += 1
+                item = {
+                    "type": row["type"],
+                    "timestamp": row["timestamp"],
+                    "topic": row["key"]
+                }
 
-        for item in entity_ctx + topic_ctx:
-            key = (item["type"], item["timestamp"])
-            if key not in seen:
-                seen.add(key)
-                merged.append(item)
+            deduped.setdefault((row["type"], row["timestamp"]), item)
 
         return {
-            "past_events": merged,
-            "entity_count": len(entity_ctx),
-            "topic_count": len(topic_ctx)
+            "past_events": list(deduped.values()),
+            "entity_count": entity_count,
+            "topic_count": topic_count
         }
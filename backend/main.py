@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import List, Literal, Any, Dict, Optional
+import asyncio
 import os
+import time
 import logging
 from dotenv import load_dotenv
+from neo4j import AsyncGraphDatabase
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -15,7 +18,7 @@ load_dotenv()  # Load .env before any os.environ.get() calls
 logger = logging.getLogger(__name__)
 
 # Internal module integrations
-from .rag.extractor import extract_entities
+from .rag.extractor import extract_entities, extract_entities_batch
 from .graph.retriever import GraphRetriever
 from .graph.graph import GraphMemory
 from .rag.baseline import add_user_message, build_baseline_context
@@ -25,6 +28,35 @@ from .evaluation.crs_evaluator import CRSEvaluator, CRSScores
 
 app = FastAPI()
 
+@app.on_event("startup")
+async def startup_event():
+    """
+    Build one shared Neo4j driver for the process. Driver construction is
+    expensive (TLS handshake, pool init), so it happens once here and every
+    request reuses the built-in connection pool.
+    """
+    uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+    username = os.environ.get("NEO4J_USERNAME", "neo4j")
+    password = os.environ.get("NEO4J_PASSWORD", "password")
+
+    app.state.driver = AsyncGraphDatabase.driver(
+        uri,
+        auth=(username, password),
+        max_connection_pool_size=100,
+        max_connection_lifetime=3600
+    )
+
+    # Index-backed MERGE/MATCH lookups require the constraints to exist;
+    # failure here is non-fatal so the app can still boot without Neo4j.
+    try:
+        await GraphMemory(app.state.driver).ensure_schema()
+    except Exception as e:
+        logger.warning("Could not ensure Neo4j schema at startup: %s", e)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await app.state.driver.close()
+
 # Request model for the chat endpoint
 class ChatRequest(BaseModel):
     user_id: str
@@ -58,34 +90,45 @@ async def chat(request: ChatRequest):
     topics = extraction.get("topics", [])
 
     prompt = ""
+    context_text = ""
 
     # b) IF mode == "graph"
     if request.mode == "graph":
         try:
-            # Instantiate GraphRetriever using env vars
-            uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
-            username = os.environ.get("NEO4J_USERNAME", "neo4j")
-            password = os.environ.get("NEO4J_PASSWORD", "password")
-            
-            retriever = GraphRetriever(uri, username, password)
-            try:
-                graph_context = retriever.retrieve_context(
-                    request.user_id, 
-                    entities, 
+            retriever = GraphRetriever(app.state.driver)
+            memory = GraphMemory(app.state.driver)
+
+            # Retrieval and the write of the current event are independent
+            # Bolt round-trips, so they run concurrently instead of serially.
+            # We want context from past events, not the current one: the
+            # timestamp snapshot taken here, before the write starts, keeps
+            # the event that write creates out of the retrieval result even
+            # when its transaction commits first.
+            now = time.time_ns()
+            graph_context, write_result = await asyncio.gather(
+                retriever.retrieve_context(
+                    request.user_id,
+                    entities,
+                    topics,
+                    before=now
+                ),
+                memory.write_interaction(
+                    request.user_id,
+                    request.message,
+                    entities,
                     topics
-                )
-                # Use build_prompt ONLY for graph mode dictionary context
-                prompt = build_prompt(graph_context, request.message)
-            finally:
-                retriever.close()
-            
-            # Retrieve THEN Write: We want context from past events, not the current one.
-            try:
-                memory = GraphMemory(uri, username, password)
-                memory.write_interaction(request.user_id, request.message, entities, topics)
-                memory.close()
-            except Exception as e:
-                logger.warning("Graph write failed (non-blocking): %s", e)
+                ),
+                return_exceptions=True
+            )
+            if isinstance(graph_context, BaseException):
+                raise graph_context
+            if isinstance(write_result, BaseException):
+                logger.warning("Graph write failed (non-blocking): %s", write_result)
+
+            # Format the memory context once; the same string feeds both the
+            # prompt and the CRS evaluation below.
+            context_text = format_memory_context(graph_context)
+            prompt = build_prompt(context_text, request.message)
         except Exception as e:
             logger.error("Graph retrieval failed: %s", e)
             return ChatResponse(
@@ -96,32 +139,31 @@ async def chat(request: ChatRequest):
     # c) IF mode == "baseline"
     elif request.mode == "baseline":
         add_user_message(request.user_id, request.message)
-        baseline_context = build_baseline_context(request.user_id)
-        
-        # Explicit construction for baseline string context (bypasses build_prompt)
-        prompt = f"{baseline_context}\n\nUser Query:\n{request.message}"
-
-    # d) Send the prompt to the LLM
-    llm_response = generate_response(prompt)
-
-    # e) Calculate CRS Scores
-    # We need the context text.
-    context_text = ""
-    if request.mode == "baseline":
-        # For baseline, we rebuild it or capture it. 
-        # (Ideally we captured it above, but to avoid large refactors we rebuild/access it here)
-        # Note: baseline_context is available in this scope if mode==baseline
-        context_text = locals().get("baseline_context", "")
-    elif request.mode == "graph":
-        # For graph, we format the context dictionary
-        # graph_context is available in local scope
-        context_text = format_memory_context(locals().get("graph_context", {}))
+        context_text = build_baseline_context(request.user_id)
 
+        # Explicit construction for baseline string context (bypasses build_prompt)
+        prompt = f"{context_text}\n\nUser Query:\n{request.message}"
+
+    # d) Send the prompt to the LLM. The Gemini SDK is synchronous, so the
+    # call runs in a worker thread to keep the event loop free for other
+    # requests during the (multi-second) generation wait.
+    llm_response = await asyncio.to_thread(generate_response, prompt)
+
+    # An empty response means there is nothing to score; skip CRS entirely
+    # rather than running the NER pipeline over blank text.
+    if not llm_response.strip():
+        return ChatResponse(
+            response=llm_response,
+            context_used=entities + topics,
+            crs_scores=None
+        )
+
+    # e) Calculate CRS Scores using the context captured at prompt-build time
     crs = crs_evaluator.evaluate(
         query_text=request.message,
         response_text=llm_response,
         context_text=context_text,
-        extract_func=extract_entities
+        extract_batch_func=extract_entities_batch
     )
 
     # f) Return the LLM response
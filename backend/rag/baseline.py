@@ -4,14 +4,51 @@ dialogue system. It stores a limited history of recent user messages to provide
 basic context without relying on graph traversals or vector search.
 """
 
-from collections import deque, defaultdict
-from typing import Dict, Deque
+import threading
+from collections import deque
+from typing import Deque
+
+from cachetools import TTLCache
 
 # Configuration
 _MAX_HISTORY_LENGTH = 5
-# Process-local storage for user history. 
-# Using deque with maxlen handles eviction automatically.
-_USER_MEMORY: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=_MAX_HISTORY_LENGTH))
+_MAX_USERS = 10_000
+_USER_TTL_SECONDS = 3600
+
+class _UserHistory:
+    """
+    Per-user message deque plus a version-stamped cache of the formatted
+    context string. The version bumps on every append, so the string is
+    rebuilt at most once per new message no matter how often it is read.
+    """
+
+    __slots__ = ("messages", "version", "_cached_version", "_cached_text")
+
+    def __init__(self):
+        self.messages: Deque[str] = deque(maxlen=_MAX_HISTORY_LENGTH)
+        self.version = 0
+        self._cached_version = -1
+        self._cached_text = ""
+
+    def append(self, message: str) -> None:
+        self.messages.append(message)
+        self.version += 1
+
+    def formatted(self) -> str:
+        if self._cached_version != self.version:
+            lines = ["Previous conversation:"]
+            lines.extend(f"- {msg}" for msg in self.messages)
+            self._cached_text = "\n".join(lines)
+            self._cached_version = self.version
+        return self._cached_text
+
+# Process-local storage for user history, bounded in user count so inactive
+# users are evicted instead of leaking memory for the lifetime of the worker.
+# Each user still keeps a deque whose maxlen handles per-user eviction.
+_USER_MEMORY: TTLCache = TTLCache(maxsize=_MAX_USERS, ttl=_USER_TTL_SECONDS)
+# FastAPI may touch the store from multiple threadpool tasks; TTLCache is not
+# thread-safe on its own.
+_MEMORY_LOCK = threading.RLock()
 
 def add_user_message(user_id: str, message: str) -> None:
     """
@@ -22,7 +59,13 @@ def add_user_message(user_id: str, message: str) -> None:
         user_id (str): Unique identifier for the user.
         message (str): The text content of the user's message.
     """
-    _USER_MEMORY[user_id].append(message)
+    with _MEMORY_LOCK:
+        history: _UserHistory = _USER_MEMORY.get(user_id)
+        if history is None:
+            history = _UserHistory()
+        # (Re)insert to refresh the user's TTL on activity
+        _USER_MEMORY[user_id] = history
+        history.append(message)
 
 def build_baseline_context(user_id: str) -> str:
     """
@@ -36,14 +79,10 @@ def build_baseline_context(user_id: str) -> str:
         str: A formatted string summarizing previous messages, or an empty string
              if no history exists.
     """
-    history = _USER_MEMORY.get(user_id)
-    
-    if not history:
-        return ""
+    with _MEMORY_LOCK:
+        history = _USER_MEMORY.get(user_id)
 
-    lines = ["Previous conversation:"]
-    for msg in history:
-        lines.append(f"- {msg}")
-    
-    return "\n".join(lines)
+        if history is None or not history.messages:
+            return ""
 
+        return history.formatted()
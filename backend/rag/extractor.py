@@ -1,35 +1,103 @@
+import functools
+import re
+
 import spacy
 
+# Topic keyword rules, compiled once into a single alternation so topic
+# detection is one linear scan over the text instead of one substring search
+# per keyword. Longer keywords come first so e.g. "language model" wins over
+# any shorter overlapping alternative.
+_TOPIC_KEYWORDS = {
+    "LLMs": ("llm", "gpt", "transformer", "language model"),
+    "RAG": ("rag", "retrieval", "vector store"),
+    "Knowledge Graphs": ("graph", "node", "edge", "triplet")
+}
+_KEYWORD_TO_TOPIC = {
+    kw: topic
+    for topic, keywords in _TOPIC_KEYWORDS.items()
+    for kw in keywords
+}
+# IGNORECASE lets the scan run over the original text, so no lowercased copy
+# of (potentially long) response/context strings is ever allocated. The
+# alternation sits inside a zero-width lookahead so matches may overlap:
+# a bare alternation would consume "rag" out of "paragraph" and never see
+# the "graph" starting two characters later, silently dropping a topic.
+_TOPIC_PATTERN = re.compile(
+    "(?=("
+    + "|".join(
+        re.escape(kw)
+        for kw in sorted(_KEYWORD_TO_TOPIC, key=len, reverse=True)
+    )
+    + "))",
+    re.IGNORECASE
+)
+
+# Pipeline components NER does not need: only tok2vec + ner are required for
+# doc.ents, so the rest are excluded at load time and never instantiated.
+_UNUSED_PIPES = ("parser", "lemmatizer", "attribute_ruler", "senter")
+
 # Load the spaCy model
 # Note: Ensure 'en_core_web_sm' is installed in the environment
-nlp = spacy.load("en_core_web_sm")
+nlp = spacy.load("en_core_web_sm", exclude=list(_UNUSED_PIPES))
+
+
+def _match_topics(text: str) -> list:
+    """
+    Lightweight topic mapping: one case-insensitive pass of the precompiled
+    keyword pattern, mapped back to topic labels in the stable
+    _TOPIC_KEYWORDS order. Only the short matched keywords are lowercased,
+    never the full text.
+    """
+    found = {
+        _KEYWORD_TO_TOPIC[m.group(1).lower()]
+        for m in _TOPIC_PATTERN.finditer(text)
+    }
+    return [topic for topic in _TOPIC_KEYWORDS if topic in found]
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_cached(text: str) -> tuple:
+    """
+    Runs the full spaCy pipeline plus topic rules for one text. Results are
+    memoized by the exact string: /chat runs extraction on the same message
+    repeatedly (retrieval, then CRS scoring), and the cache lets every call
+    after the first skip the NER forward pass entirely. Returns frozen tuples
+    so cached values are immutable.
+    """
+    doc = nlp(text)
+
+    # Extract entity text strings and remove duplicates; dict.fromkeys dedups
+    # in one container and keeps first-seen order (deterministic downstream)
+    entities = tuple(dict.fromkeys(ent.text for ent in doc.ents))
+
+    return entities, tuple(_match_topics(text))
+
 
 def extract_entities(text: str) -> dict:
     """
     Extracts named entities from text using spaCy and identifies topics based on predefined keyword rules.
     """
-    doc = nlp(text)
-    
-    # Extract entity text strings and remove duplicates
-    entities = list(set(ent.text for ent in doc.ents))
-    
-    # Lightweight topic mapping using simple keyword rules
-    topics = []
-    lower_text = text.lower()
-    
-    # Keywords for LLMs topic
-    if any(kw in lower_text for kw in ["llm", "gpt", "transformer", "language model"]):
-        topics.append("LLMs")
-    
-    # Keywords for RAG topic
-    if any(kw in lower_text for kw in ["rag", "retrieval", "vector store"]):
-        topics.append("RAG")
-    
-    # Keywords for Knowledge Graphs topic
-    if any(kw in lower_text for kw in ["graph", "node", "edge", "triplet"]):
-        topics.append("Knowledge Graphs")
-    
+    entities, topics = _extract_cached(text)
     return {
-        "entities": entities,
-        "topics": topics
-    }
\ No newline at end of file
+        "entities": list(entities),
+        "topics": list(topics)
+    }
+
+
+def extract_entities_batch(texts: list) -> list:
+    """
+    Extracts entities/topics for several texts in one nlp.pipe pass, sharing
+    tokenizer state and batching the NER tagger instead of running one full
+    forward pass per text. Components NER does not use are disabled for the
+    batch. Returns one {"entities", "topics"} dict per input text, in order.
+    """
+    disable = [p for p in _UNUSED_PIPES if p in nlp.pipe_names]
+    docs = nlp.pipe(texts, batch_size=max(len(texts), 1), disable=disable)
+
+    results = []
+    for text, doc in zip(texts, docs):
+        results.append({
+            "entities": list(dict.fromkeys(ent.text for ent in doc.ents)),
+            "topics": _match_topics(text)
+        })
+    return results
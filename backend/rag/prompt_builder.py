@@ -6,59 +6,56 @@ It acts as a translation layer between structured retrieval data and the text ge
 
 from typing import Dict, Any
 
+# Format: "Previously, the user mentioned the entity 'Neo4j' in a query."
+# %-substitution skips f-string format-spec handling per event, which adds up
+# on long event lists.
+_EVENT_TMPL = '- Previously, the user mentioned the entity "%s" in a query.'
+
 def format_memory_context(context: Dict[str, Any]) -> str:
     """
     Formats the graph context into a string representation for the LLM or Evaluator.
     """
-    memory_lines = []
-    
-    past_events = context.get("past_events", [])
-    if past_events:
-        for event in past_events:
-            entity = event.get("entity")
-            if entity:
-                # Format: "Previously, the user mentioned the entity 'Neo4j' in a query."
-                memory_lines.append(f"- Previously, the user mentioned the entity \"{entity}\" in a query.")
+    # Bind the bound method once; every field below is then a plain local
+    # call instead of a repeated LOAD_METHOD on the context dict.
+    context_get = context.get
+    past_events = context_get("past_events") or ()
+    entity_count = context_get("entity_count", 0)
+    topic_count = context_get("topic_count", 0)
+
+    # The per-event .get stays: topic-only rows legitimately lack the
+    # "entity" key, so an itemgetter/KeyError scheme would cost more.
+    memory_lines = [
+        _EVENT_TMPL % entity
+        for event in past_events
+        if (entity := event.get("entity"))
+    ]
+
+    parts = (f"{entity_count} distinct entities",) if entity_count else ()
+    if topic_count:
+        parts += (f"{topic_count} topics",)
+    if parts:
+        memory_lines.append(f"- The conversation includes {' and '.join(parts)}.")
 
-    entity_count = context.get("entity_count", 0)
-    topic_count = context.get("topic_count", 0)
-    
-    if entity_count > 0 or topic_count > 0:
-        count_summary = "- The conversation includes"
-        parts = []
-        if entity_count > 0:
-            parts.append(f"{entity_count} distinct entities")
-        if topic_count > 0:
-            parts.append(f"{topic_count} topics")
-        
-        count_summary += " " + " and ".join(parts) + "."
-        memory_lines.append(count_summary)
-        
     return "\n".join(memory_lines)
 
-def build_prompt(context: Dict[str, Any], query: str) -> str:
+def build_prompt(memory_context: str, query: str) -> str:
     """
-    Constructs a prompt for the LLM by combining the retrieved context and the user's query.
+    Constructs a prompt for the LLM by combining the already-formatted memory
+    context (see format_memory_context) and the user's query. Taking the
+    preformatted string lets the caller reuse it (e.g. for CRS scoring)
+    without formatting the context twice.
 
     Args:
-        context (dict): A dictionary containing retrieval results.
+        memory_context (str): Formatted memory context, possibly empty.
         query (str): The raw input query from the user.
 
     Returns:
         str: A formatted natural language string suitable for direct input to an LLM.
     """
-    sections = []
-
-    # Process Memory Context
-    memory_str = format_memory_context(context)
-
-    if memory_str:
-        sections.append("Memory Context:")
-        sections.append(memory_str)
-        sections.append("") # Add spacing
-
-    # Process User Query
-    sections.append("User Query:")
-    sections.append(query)
+    # Fast path first: the common first-turn case has no memory context at
+    # all. Both shapes are single f-strings (BUILD_STRING assembles the
+    # operands from the stack, no sections list or join).
+    if not memory_context:
+        return f"User Query:\n{query}"
 
-    return "\n".join(sections)
+    return f"Memory Context:\n{memory_context}\n\nUser Query:\n{query}"
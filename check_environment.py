@@ -0,0 +1,198 @@
+"""
+Pre-flight environment check for GraphRAG.
+
+Verifies that the required packages are resolvable, the expected environment
+variables are set, the backend module layout is intact, and the spaCy language
+model is installed. Run it from the repository root before starting the
+backend:
+
+    python check_environment.py
+"""
+
+import functools
+import importlib.util
+import os
+import sys
+from collections import defaultdict
+
+# Import names of the packages the backend and frontend need at runtime
+REQUIRED_PACKAGES = [
+    "fastapi",
+    "uvicorn",
+    "pydantic",
+    "dotenv",
+    "neo4j",
+    "spacy",
+    "google.generativeai",
+    "redis",
+    "cachetools",
+    "numpy",
+    "requests",
+    "httpx",
+    "streamlit",
+    "pandas",
+    "altair"
+]
+
+REQUIRED_ENV_VARS = {
+    "GEMINI_API_KEY": "Google Gemini API key",
+    "NEO4J_URI": "Neo4j connection URI",
+    "NEO4J_USERNAME": "Neo4j username",
+    "NEO4J_PASSWORD": "Neo4j password"
+}
+
+REQUIRED_FILES = [
+    "backend/main.py",
+    "backend/cache.py",
+    "backend/graph/graph.py",
+    "backend/graph/retriever.py",
+    "backend/rag/extractor.py",
+    "backend/rag/baseline.py",
+    "backend/rag/prompt_builder.py",
+    "backend/llm/gemini_client.py",
+    "backend/evaluation/crs_evaluator.py",
+    "frontend/ui.py"
+]
+
+
+def check_dependencies():
+    """
+    Checks that every required package resolves on sys.path.
+
+    find_spec only locates the package, it does not execute its __init__,
+    so heavy stacks (spacy pulls in thinc/numpy, etc.) are never actually
+    imported just to confirm they are installed.
+
+    Returns (ok, lines); output is buffered by the caller into one write.
+    """
+    out = ["Checking dependencies..."]
+    missing = []
+    for package in REQUIRED_PACKAGES:
+        try:
+            spec = importlib.util.find_spec(package)
+        except ModuleNotFoundError:
+            # Raised for dotted names whose parent package is absent
+            spec = None
+        if spec is None:
+            out.append(f"  [MISSING] {package}")
+            missing.append(package)
+        else:
+            out.append(f"  [ok] {package}")
+
+    if missing:
+        out.append(f"Missing packages: {', '.join(missing)}")
+        out.append("Install them with: python -m pip install -r requirements.txt")
+    return not missing, out
+
+
+def check_environment_variables():
+    """
+    Checks that the required environment variables are set (a .env file in
+    the repository root is loaded first when python-dotenv is available).
+    """
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    out = ["Checking environment variables..."]
+    # One snapshot of the process environment; each lookup below is then a
+    # dict probe instead of a per-call walk of the C environ array.
+    envmap = dict(os.environ)
+    ok = True
+    for var, description in REQUIRED_ENV_VARS.items():
+        value = envmap.get(var)
+        if not value:
+            out.append(f"  [MISSING] {var} ({description})")
+            ok = False
+        else:
+            out.append(f"  [ok] {var}")
+
+    if not ok:
+        out.append("Add the missing variables to your .env file (see .env.example).")
+    return ok, out
+
+
+def check_backend_structure():
+    """
+    Checks that the expected source files are present.
+
+    Files are grouped by directory and each directory is listed with a
+    single os.scandir call; membership is then tested in Python. That is one
+    syscall per directory instead of one stat per required file.
+    """
+    out = ["Checking repository structure..."]
+    groups = defaultdict(list)
+    for path in REQUIRED_FILES:
+        groups[os.path.dirname(path)].append(path)
+
+    ok = True
+    for directory, paths in groups.items():
+        try:
+            entries = {entry.name for entry in os.scandir(directory)}
+        except FileNotFoundError:
+            entries = set()
+
+        for path in paths:
+            if os.path.basename(path) in entries:
+                out.append(f"  [ok] {path}")
+            else:
+                out.append(f"  [MISSING] {path}")
+                ok = False
+    return ok, out
+
+
+@functools.lru_cache(maxsize=1)
+def check_spacy_model():
+    """
+    Checks that the spaCy language model is installed, without loading it:
+    spacy.util.is_package confirms installation while spacy.load would parse
+    meta.json, instantiate the pipeline, and mmap vectors just to prove
+    presence. The result is memoized for reuse by other tooling.
+    """
+    out = ("Checking spaCy language model...",)
+    if importlib.util.find_spec("en_core_web_sm") is None:
+        return False, out + (
+            "  [MISSING] en_core_web_sm",
+            "Install it with: python -m spacy download en_core_web_sm"
+        )
+
+    try:
+        import spacy.util
+        ok = spacy.util.is_package("en_core_web_sm")
+    except (ImportError, LookupError):
+        ok = False
+
+    if ok:
+        return True, out + ("  [ok] en_core_web_sm",)
+    return False, out + (
+        "  [MISSING] en_core_web_sm",
+        "Install it with: python -m spacy download en_core_web_sm"
+    )
+
+
+def main():
+    results = [
+        check_dependencies(),
+        check_environment_variables(),
+        check_backend_structure()
+    ]
+    # The model check needs spacy itself, so only attempt it when the
+    # dependency check passed.
+    if results[0][0]:
+        results.append(check_spacy_model())
+
+    ok = all(status for status, _ in results)
+    lines = [line for _, section in results for line in section]
+    lines.append(
+        "Environment OK." if ok
+        else "Environment check failed; see messages above."
+    )
+    # One buffered write instead of one syscall per line
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
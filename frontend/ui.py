@@ -1,7 +1,15 @@
+import os
+
 import streamlit as st
-import time
-import requests
-import pandas as pd
+import numpy as np
+from collections import deque
+
+# Resolved once per script run instead of per chat turn
+_BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000/chat")
+
+# Oldest chat turns are evicted past this point so per-rerun render cost and
+# session memory stay bounded on long-lived sessions.
+_MAX_MESSAGES = 200
 
 # -------------------------------
 # Page Configuration (MUST BE FIRST)
@@ -14,7 +22,13 @@ st.set_page_config(
 # -------------------------------
 # Custom CSS Styling
 # -------------------------------
-st.markdown("""
+@st.cache_resource
+def _style_block():
+    """
+    Returns the static CSS once per session; reruns reuse the cached string
+    instead of re-evaluating the literal on every interaction.
+    """
+    return """
 <style>
 
 /* Main app background */
@@ -47,77 +61,161 @@ textarea {
     gap: 20px;
 }
 
-/* Dashboard Cards */
-.metric-card {
+/* Dashboard metrics (st.metric) */
+[data-testid="stMetric"] {
     background-color: rgba(255, 255, 255, 0.05);
     border-radius: 15px;
     padding: 20px;
-    margin-bottom: 20px;
     border: 1px solid rgba(255, 255, 255, 0.1);
 }
 
-.card-graph {
-    border-left: 5px solid #00f260; /* Neo Green */
-    box-shadow: 0 0 15px rgba(0, 242, 96, 0.1);
-}
-
-.card-baseline {
-    border-left: 5px solid #a770ef; /* Purple */
-    box-shadow: 0 0 15px rgba(167, 112, 239, 0.1);
-}
-
-.metric-value {
-    font-size: 2.5rem;
-    font-weight: 700;
-    margin: 0;
-}
-
-.metric-label {
-    font-size: 0.9rem;
-    color: #cccccc;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-}
-
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_style_block(), unsafe_allow_html=True)
 
 # -------------------------------
 # State Initialization
 # -------------------------------
+class _ScoreSeries:
+    """
+    Growable float32 score history. Appends are amortized O(1) via capacity
+    doubling (vector-style), and the data already lives in one NumPy array,
+    so the dashboard charts it without a per-rerun list-to-array conversion
+    or object-dtype columns.
+    """
+    __slots__ = ("_arr", "_len", "_sum")
+
+    def __init__(self, capacity=64):
+        self._arr = np.full(capacity, np.nan, dtype=np.float32)
+        self._len = 0
+        self._sum = 0.0
+
+    def append(self, value):
+        if self._len == len(self._arr):
+            self._arr = np.append(
+                self._arr,
+                np.full(len(self._arr), np.nan, dtype=np.float32)
+            )
+        self._arr[self._len] = value
+        self._len += 1
+        self._sum += float(value)
+
+    def __len__(self):
+        return self._len
+
+    def values(self):
+        """View of the filled prefix (no copy)."""
+        return self._arr[:self._len]
+
+    def mean(self):
+        """Running average maintained at append time — O(1) per render."""
+        return self._sum / self._len if self._len else 0.0
+
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=_MAX_MESSAGES)
 
 if "baseline_scores" not in st.session_state:
-    st.session_state.baseline_scores = []
+    st.session_state.baseline_scores = _ScoreSeries()
 
 if "graph_scores" not in st.session_state:
-    st.session_state.graph_scores = []
+    st.session_state.graph_scores = _ScoreSeries()
 
 # -------------------------------
 # Backend Integration
 # -------------------------------
+# Maps the sidebar radio labels to backend mode tokens: a dict probe per
+# turn instead of a substring scan, and the UI strings stay decoupled from
+# the API contract.
+_MODE_MAP = {
+    "Baseline RAG (Text Memory)": "baseline",
+    "Graph-RAG (Graph Memory)": "graph"
+}
+
+@st.cache_resource
+def _event_loop():
+    """
+    Background event loop shared by the whole Streamlit process, spinning
+    in its own daemon thread. One long-lived loop keeps the async client's
+    pooled keep-alive connections valid across reruns, and because callers
+    submit work instead of driving the loop themselves, simultaneous
+    sessions queue safely rather than racing run_until_complete on the
+    same loop.
+    """
+    import asyncio
+    import threading
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def _run_async(coro):
+    """Runs a coroutine on the shared background loop; safe to call from
+    any Streamlit script thread."""
+    import asyncio
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+@st.cache_resource
+def _aclient():
+    """
+    Shared async HTTP client: keep-alive pooling plus HTTP/2 multiplexing
+    against the FastAPI backend, reused across all chat turns. The transport
+    retries connect failures twice (the httpx analog of the old urllib3
+    Retry(total=2) adapter config) so a backend mid-restart does not surface
+    as an immediate error in the chat panel.
+
+    httpx is imported lazily here, so a session that never sends a message
+    never pays the import cost; after the first call sys.modules makes the
+    import free.
+    """
+    import httpx
+
+    # http2/limits live on the transport: client-level settings are ignored
+    # once an explicit transport is supplied.
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(60, connect=3),
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+    )
+
+async def _post_chat(payload):
+    response = await _aclient().post(_BACKEND_URL, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _cached_backend(user_id, message, mode):
+    """
+    Memoized backend call: repeating the same (user, message, mode) within
+    the TTL reuses the previous answer and skips the whole LLM round-trip.
+    Errors raise and are therefore never cached.
+    """
+    return _run_async(_post_chat({
+        "user_id": user_id,
+        "message": message,
+        "mode": mode
+    }))
+
 def get_backend_response(user_input, mode_selection):
     """
     Calls the real FastAPI backend to get a response.
     """
-    # Use environment variable for backend URL, default to localhost
-    import os
-    url = os.getenv("BACKEND_URL", "http://localhost:8000/chat")
-    
+    url = _BACKEND_URL
+
     # Map UI selection to backend modes
-    backend_mode = "graph" if "Graph-RAG" in mode_selection else "baseline"
-    
-    payload = {
-        "user_id": "demo_user",
-        "message": user_input,
-        "mode": backend_mode
-    }
-    
+    backend_mode = _MODE_MAP.get(mode_selection, "baseline")
+
     try:
-        response = requests.post(url, json=payload, timeout=60)
-        response.raise_for_status()
-        return response.json()
+        if st.session_state.get("bypass_cache"):
+            return _run_async(_post_chat({
+                "user_id": "demo_user",
+                "message": user_input,
+                "mode": backend_mode
+            }))
+        return _cached_backend("demo_user", user_input, backend_mode)
     except Exception as e:
         return {
             "response": f"⚠️ Error: Could not connect to the backend at {url}. ({str(e)})",
@@ -156,25 +254,109 @@ with st.sidebar:
     **Graph-RAG**
     Uses entity relationships + context.
     """)
-    
+
+    st.checkbox(
+        "Bypass response cache",
+        key="bypass_cache",
+        help="Always hit the backend, even for repeated questions (demo mode)."
+    )
+
+    history_cap = st.slider(
+        "Chat history limit", 50, 500, _MAX_MESSAGES, step=50,
+        help="Oldest turns beyond this are dropped to keep reruns fast."
+    )
+    if history_cap != st.session_state.messages.maxlen:
+        # Rebuild the deque with the new bound; the deque keeps enforcing
+        # it on append, so the render loop stays O(cap) from here on.
+        st.session_state.messages = deque(
+            st.session_state.messages, maxlen=history_cap
+        )
+
     if st.button("Clear History"):
-        st.session_state.messages = []
-        st.session_state.baseline_scores = []
-        st.session_state.graph_scores = []
+        st.session_state.messages = deque(maxlen=history_cap)
+        st.session_state.baseline_scores = _ScoreSeries()
+        st.session_state.graph_scores = _ScoreSeries()
         st.rerun()
 
+# -------------------------------
+# Dashboard Helpers
+# -------------------------------
+# Past this many points a line chart is visually identical but the Vega
+# render/hover path gets noticeably slower, so longer sessions are thinned.
+_CHART_MAX_POINTS = 500
+
+# Hover tooltips instantiate DOM elements per point; past this many rows
+# they are disabled so hovering a dense chart stays cheap.
+_TOOLTIP_MAX_POINTS = 1000
+
+def _downsample(xs, target=_CHART_MAX_POINTS):
+    """
+    Stride-thins a sequence to at most ~target points. Series padded to the
+    same length get the same stride, so parallel columns stay aligned.
+    """
+    step = len(xs) // target
+    return xs if step <= 1 else xs[::step]
+
+def _chart_series(scores, max_len):
+    """
+    NaN-padded float32 column for the CRS chart, built in one allocation
+    instead of concatenating a growing list of None per rerun.
+    """
+    arr = np.full(max_len, np.nan, dtype=np.float32)
+    arr[:len(scores)] = scores
+    return arr
+
+@st.cache_data(max_entries=4)
+def _build_chart_df(g_scores, b_scores):
+    """
+    Memoized chart frame keyed on the score tuples: hover and sidebar
+    reruns reuse the previous frame, so only an actual new turn pays the
+    padding/concat work. The O(N) tuple hash is far cheaper than the
+    pandas construction it skips.
+    """
+    import pandas as pd
+
+    max_len = max(len(g_scores), len(b_scores))
+
+    # Pad to a common length with NaN (float32 keeps the columns on the
+    # numeric fast path), then thin both series and the turn index with
+    # the same stride so turn numbers stay aligned. Sharing one named
+    # index and concatenating in a single shot sidesteps pandas'
+    # fragmented-frame path entirely.
+    turn_idx = pd.Index(
+        _downsample(np.arange(1, max_len + 1, dtype=np.int32)),
+        name="Turn"
+    )
+    df = pd.concat([
+        pd.Series(
+            _downsample(_chart_series(g_scores, max_len)),
+            index=turn_idx, name="Graph-RAG"
+        ),
+        pd.Series(
+            _downsample(_chart_series(b_scores, max_len)),
+            index=turn_idx, name="Baseline"
+        )
+    ], axis=1)
+    # Long format, melted once here so Altair does not reshape per render.
+    return df.reset_index().melt("Turn", var_name="System", value_name="CRS")
+
 # -------------------------------
 # Page Logic
 # -------------------------------
-if page == "💬 Chat Interface":
+@st.fragment
+def _chat_panel(mode):
+    """
+    Transcript, chat input, and send handler as one fragment: a send reruns
+    only this block, so the sidebar, CSS, and dashboard logic never
+    re-execute per message. History and the new bubbles live in the same
+    container, keeping the transcript consistent across fragment reruns.
+    """
     # -------------------------------
     # Chat History
     # -------------------------------
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
-            
-
 
     # -------------------------------
     # Chat Input
@@ -193,12 +375,12 @@ if page == "💬 Chat Interface":
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 backend_data = get_backend_response(user_input, mode)
-                
+
                 response_text = backend_data.get("response", "No response")
                 crs_data = backend_data.get("crs_scores")
-                
+
                 st.markdown(response_text)
-                
+
                 if crs_data:
                     # Update History for Dashboard
                     score_val = crs_data.get("composite_score", 0)
@@ -214,7 +396,12 @@ if page == "💬 Chat Interface":
             "content": response_text,
             "crs": crs_data
         })
-        st.rerun() # Rerun to update dashboard immediately
+        # No st.rerun(): both bubbles are already drawn above, and the
+        # dashboard aggregates the score arrays on render, so switching
+        # pages picks up this turn without re-executing the whole script.
+
+if page == "💬 Chat Interface":
+    _chat_panel(mode)
 
 elif page == "📊 CRS Dashboard":
     st.markdown("## Context Retention Score (CRS)")
@@ -227,37 +414,30 @@ elif page == "📊 CRS Dashboard":
     in the chatbot's responses. Higher scores indicate better memory retention.
     """)
     
-    # Calculate Averages
-    def get_avg(scores):
-        return sum(scores) / len(scores) if scores else 0.0
-
-    avg_graph = get_avg(st.session_state.graph_scores) * 100
-    avg_base = get_avg(st.session_state.baseline_scores) * 100
+    # Calculate Averages (O(1) from the running sums, not a per-render scan)
+    avg_graph = st.session_state.graph_scores.mean() * 100
+    avg_base = st.session_state.baseline_scores.mean() * 100
     
     col1, col2 = st.columns(2)
-    
+
+    # Native st.metric instead of hand-rolled HTML cards: no per-rerun
+    # string assembly or unsafe_allow_html DOM rebuild.
     with col1:
-        st.markdown(f"""
-        <div class="metric-card card-graph">
-            <h3 style="color:#00f260">🧠 Memory-Centric (Graph)</h3>
-            <p class="metric-label">Average CRS</p>
-            <p class="metric-value" style="color:#00f260">{avg_graph:.1f}%</p>
-            <br>
-            <p>Conversation Turns: {len(st.session_state.graph_scores)}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.metric(
+            label="🧠 Memory-Centric (Graph) — Average CRS",
+            value=f"{avg_graph:.1f}%",
+            delta=f"{len(st.session_state.graph_scores)} turns",
+            delta_color="off"
+        )
         st.progress(avg_graph / 100)
-        
+
     with col2:
-        st.markdown(f"""
-        <div class="metric-card card-baseline">
-            <h3 style="color:#a770ef">📄 RAG Baseline</h3>
-            <p class="metric-label">Average CRS</p>
-            <p class="metric-value" style="color:#a770ef">{avg_base:.1f}%</p>
-            <br>
-            <p>Conversation Turns: {len(st.session_state.baseline_scores)}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.metric(
+            label="📄 RAG Baseline — Average CRS",
+            value=f"{avg_base:.1f}%",
+            delta=f"{len(st.session_state.baseline_scores)} turns",
+            delta_color="off"
+        )
         st.progress(avg_base / 100)
     
     st.divider()
@@ -265,19 +445,30 @@ elif page == "📊 CRS Dashboard":
     # Detailed History Chart
     if st.session_state.graph_scores or st.session_state.baseline_scores:
         st.subheader("Session History")
-        
-        # Normalize lengths for chart
-        max_len = max(len(st.session_state.graph_scores), len(st.session_state.baseline_scores))
-        turns = range(1, max_len + 1)
-        
-        # Pad data
-        g_data = st.session_state.graph_scores + [None] * (max_len - len(st.session_state.graph_scores))
-        b_data = st.session_state.baseline_scores + [None] * (max_len - len(st.session_state.baseline_scores))
-        
-        df = pd.DataFrame({
-            "Turn": turns,
-            "Graph-RAG": g_data,
-            "Baseline": b_data
-        })
-        
-        st.line_chart(df, x="Turn", color=["#00f260", "#a770ef"])
+
+        import altair as alt
+
+        df_long = _build_chart_df(
+            tuple(st.session_state.graph_scores.values().tolist()),
+            tuple(st.session_state.baseline_scores.values().tolist())
+        )
+
+        tooltip = (
+            ["Turn", "System", "CRS"]
+            if len(df_long) <= _TOOLTIP_MAX_POINTS
+            else alt.value(None)
+        )
+        chart = (
+            alt.Chart(df_long)
+            .mark_line(point=False, interpolate="linear")
+            .encode(
+                x=alt.X("Turn:Q", title="Turn"),
+                y=alt.Y("CRS:Q", scale=alt.Scale(domain=[0, 1])),
+                color=alt.Color("System:N", scale=alt.Scale(
+                    domain=["Graph-RAG", "Baseline"],
+                    range=["#00f260", "#a770ef"]
+                )),
+                tooltip=tooltip
+            )
+        )
+        st.altair_chart(chart, use_container_width=True)
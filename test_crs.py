@@ -0,0 +1,95 @@
+"""
+Dev script: sends one /chat request per retrieval mode and sanity-checks the
+CRS scores that come back. Run it from the repository root:
+
+    python test_crs.py
+
+Requests go through httpx's ASGITransport mounted directly on the FastAPI
+app (no server process needed), with the app's startup/shutdown handlers
+run explicitly around the checks — ASGITransport does not drive the
+lifespan itself, and graph mode needs the Neo4j driver that startup
+builds. Both modes run concurrently via asyncio.gather, so suite time is
+max(baseline, graph) instead of their sum.
+"""
+
+import asyncio
+import sys
+
+import httpx
+
+from backend.main import app
+
+_SCORE_KEYS = (
+    "context_recall",
+    "context_precision",
+    "temporal_stability",
+    "dependency_resolution",
+    "context_decay_resistance",
+    "composite_score"
+)
+
+
+async def check_mode_crs(client, mode, message):
+    """
+    Posts one chat turn in the given mode; returns (mode, problems) where
+    problems is empty when the CRS payload is well-formed.
+    """
+    response = await client.post("/chat", json={
+        "user_id": f"crs_check_{mode}",
+        "message": message,
+        "mode": mode
+    })
+    response.raise_for_status()
+    scores = response.json().get("crs_scores")
+
+    if scores is None:
+        return mode, ["no crs_scores in response (empty LLM reply?)"]
+
+    problems = []
+    for key in _SCORE_KEYS:
+        value = scores.get(key)
+        if value is None:
+            problems.append(f"missing metric {key}")
+        elif not 0.0 <= value <= 1.0:
+            problems.append(f"{key}={value} outside [0, 1]")
+    return mode, problems
+
+
+async def run_checks():
+    # ASGITransport never fires the app's lifespan events, so startup (which
+    # builds app.state.driver for graph mode) and shutdown run explicitly.
+    # transport= also survives httpx >= 0.28, where the app= shortcut is gone.
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            timeout=60
+        ) as client:
+            return await asyncio.gather(
+                check_mode_crs(client, "baseline", "Tell me about Neo4j and RAG."),
+                check_mode_crs(client, "graph", "Tell me about Neo4j and RAG.")
+            )
+    finally:
+        await app.router.shutdown()
+
+
+def main():
+    results = asyncio.run(run_checks())
+
+    failures = 0
+    lines = []
+    for mode, problems in results:
+        if problems:
+            failures += 1
+            lines.append(f"  [FAILED] {mode}: {'; '.join(problems)}")
+        else:
+            lines.append(f"  [ok] {mode}")
+
+    lines.append(f"{len(results) - failures}/{len(results)} modes return valid CRS scores.")
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())